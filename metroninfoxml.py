@@ -15,8 +15,10 @@
 from __future__ import annotations
 
 import datetime
+import functools
+import io
 import logging
-import xml.etree.ElementTree as ET
+import re
 from typing import Any
 from typing import TYPE_CHECKING
 
@@ -25,11 +27,64 @@ from comicapi._url import parse_url as parse_url
 from comicapi.genericmetadata import GenericMetadata
 from comicapi.tags import Tag
 
+try:
+    from lxml import etree as ET
+
+    lxml_available = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    lxml_available = False
+
+_fromstring = ET.fromstring
+_tostring = ET.tostring
+_Element = ET.Element
+_SubElement = ET.SubElement
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from comicapi.archivers import Archiver
 
 logger = logging.getLogger(__name__)
 
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+XSI_NAMESPACE = 'http://www.w3.org/2001/XMLSchema-instance'
+_XML_ENCODING = re.compile(rb'(?:\xef\xbb\xbf)?\s*<\?xml[^>]*?\sencoding\s*=\s*["\']([^"\']+)["\']')
+
+_parser_options: dict[str, Any] = {}
+if lxml_available:
+    # MetronInfo.xml comes from downloaded archives, only expand internal entities (as the stdlib parser does) and
+    # never load anything from the network. lxml < 5 has no 'internal' option and would treat it as resolving all
+    _parser_options = {
+        'resolve_entities': 'internal' if ET.LXML_VERSION >= (5,) else False,
+        'no_network': True,
+    }
+    # Blank text is dropped so pretty_print can re-indent merged documents, comments and PIs match the stdlib parser
+    _parser = ET.XMLParser(
+        remove_blank_text=True, remove_comments=True, remove_pis=True, huge_tree=False, **_parser_options,
+    )
+
+    # The nested lookups are compiled once, returning plain strings rather than ones tied to the tree
+    _arc_names = ET.XPath('Arc/Name/text()', smart_strings=False)
+    _credit_roles = ET.XPath('Roles/Role/text()', smart_strings=False)
+else:
+    _parser = None
+
+    def _arc_names(element: ET.Element) -> list[str]:
+        return [name.text for name in element.iterfind('Arc/Name') if name.text]
+
+    def _credit_roles(element: ET.Element) -> list[str]:
+        return [role.text for role in element.iterfind('Roles/Role') if role.text]
+
+    # ElementTree silently falls back to its pure Python implementation (e.g. on PyPy)
+    try:
+        from _elementtree import Element as _CElement
+    except ImportError:
+        _CElement = None
+    if _Element is not _CElement:
+        logger.debug('The C accelerated ElementTree is not available, MetronInfo XML handling will be slower')
+
 ADDITIONAL_CREDITS = [
     'plot',
     'story',
@@ -75,6 +130,98 @@ METRON_SOURCE_NAME: list[str] = [
     'League of Comic Geeks',
 ]
 
+_ROLE_SYNONYMS = (
+    ('Writer', GenericMetadata.writer_synonyms),
+    ('Penciller', GenericMetadata.penciller_synonyms),
+    ('Inker', GenericMetadata.inker_synonyms),
+    ('Colorist', GenericMetadata.colorist_synonyms),
+    ('Letterer', GenericMetadata.letterer_synonyms),
+    ('Cover', GenericMetadata.cover_synonyms),
+    ('Editor', GenericMetadata.editor_synonyms),
+)
+
+# casefold_synonym: Role, reversed so a synonym listed under more than one role keeps the first
+_ROLE_MAP: dict[str, str] = {
+    synonym.casefold(): role for role, synonyms in reversed(_ROLE_SYNONYMS) for synonym in synonyms
+}
+_ADDITIONAL_SET = frozenset(credit.casefold() for credit in ADDITIONAL_CREDITS)
+
+# 'Annual', 'Digital Chapter', 'Graphic Novel', 'Hardcover', 'Limited Series', 'Omnibus', 'One-Shot',
+# 'Single Issue', 'Trade Paperback'
+_FORMAT_SYNONYMS = (
+    ('Annual', ['annual']),
+    ('Digital Chapter', ['digital chapter']),
+    ('Graphic Novel', ['graphic novel']),
+    ('Hardcover', ['hardcover']),
+    ('Limited Series', ['limited series']),
+    ('Omnibus', ['omnibus']),
+    ('One-Shot', ['oneshot', 'one-shot', 'one shot', '1-shot', '1 shot', '1shot']),
+    ('Single Issue', ['single issue']),
+    ('Trade Paperback', ['trade paperback', 'collected edition', 'tpb', 'anthology', 'trade paper back']),
+)
+
+# Unknown, Everyone, Teen, Teen Plus, Mature, Explicit, Adult
+# https://metron-project.github.io/docs/metroninfo/ratings
+_MATURITY_SYNONYMS = (
+    ('Unknown', ['unknown']),
+    ('Everyone', ['everyone', 'G', 'all', 'all ages', 'a', 't']),
+    ('Teen', ['teen', 'teenager', '13+', 'T+', 'PG', 'PSR']),
+    ('Teen Plus', ['teen plus', 'teenager plus', '15+', 'parental advisory', 'PG+', 'PSR+', 'ma15+']),
+    ('Mature', ['mature', '17+', 'explicit content', 'm', 'mature 17+']),  # Why 'Explicit Content' is mature, don't know
+    ('Explicit', ['explicit', 'R']),
+    ('Adult', ['adult', 'adults only', 'adults only 18+', '18+', 'R18+', 'R+']),
+)
+
+# Top level elements in the order they are created for a new MetronInfo.xml
+# Not written: Universes, Reprints
+_CONTAINER_TAGS = (
+    'IDS', 'Number', 'Series', 'Stories', 'CollectionTitle', 'Summary', 'Notes', 'Prices', 'GTIN', 'Genres',
+    'AgeRating', 'Tags', 'Arcs', 'Characters', 'Teams', 'Locations', 'Publisher', 'CoverDate', 'URLs', 'Credits',
+    'LastModified',
+)
+
+# casefold_synonym: Format/AgeRating
+_FORMAT_MAP: dict[str, str] = {
+    synonym.casefold(): fmt for fmt, synonyms in reversed(_FORMAT_SYNONYMS) for synonym in synonyms
+}
+_MATURITY_MAP: dict[str, str] = {
+    synonym.casefold(): rating for rating, synonyms in reversed(_MATURITY_SYNONYMS) for synonym in synonyms
+}
+
+
+def _add_text_elements(parent: ET.Element, tag: str, texts: Iterable[str]) -> None:
+    """Append a tag element to parent for each of texts."""
+    for text in texts:
+        _SubElement(parent, tag).text = text
+
+
+def _add_credit(parent: ET.Element, creator: str, roles: list[str]) -> None:
+    """Append a Credit for creator and their roles to parent."""
+    if creator:
+        ele_credit = _SubElement(parent, 'Credit')
+        _SubElement(ele_credit, 'Creator').text = creator
+
+        if len(roles) > 0:
+            ele_roles = _SubElement(ele_credit, 'Roles')
+            for role in roles:
+                ele_role = _SubElement(ele_roles, 'Role')
+                ele_role.text = role
+                # if role_id:
+                # ele_role.attrib['id'] = role_id
+
+
+# MetronInfo has a fixed shallow layout so only direct children are searched
+def _get_text(element: ET.Element | None, name: str) -> str | None:
+    """Return the text of the name child of element, None if either is missing."""
+    if element is None:
+        return None
+
+    tag = element.find(name)
+    if tag is None:
+        return None
+
+    return tag.text
+
 
 class MetronInfo(Tag):
     enabled = True
@@ -129,45 +276,49 @@ class MetronInfo(Tag):
         return archive.supports_files()
 
     def has_tags(self, archive: Archiver) -> bool:
-        try:  # read_file can cause an exception
-            return (
-                self.supports_tags(archive)
-                and self.file in archive.get_filename_list()
-                and self._validate_bytes(archive.read_file(self.file))
-            )
-        except Exception:
-            return False
+        return self._read_xml(archive) is not None
 
     def remove_tags(self, archive: Archiver) -> bool:
         return self.has_tags(archive) and archive.remove_file(self.file)
 
     def read_tags(self, archive: Archiver) -> GenericMetadata:
-        if self.has_tags(archive):
-            try:  # read_file can cause an exception
-                metadata = archive.read_file(self.file) or b''
-                if self._validate_bytes(metadata):
-                    return self._metadata_from_bytes(metadata)
+        xml = self._read_xml(archive)
+        if xml is not None:
+            try:
+                return self._metadata_from_bytes(xml)
             except Exception:
                 ...
         return GenericMetadata()
 
     def read_raw_tags(self, archive: Archiver) -> str:
-        try:  # read_file can cause an exception
-            if self.has_tags(archive):
-                b = archive.read_file(self.file)
-                # ET.fromstring is used as xml can declare the encoding
-                return ET.tostring(ET.fromstring(b), encoding='unicode', xml_declaration=True)
-        except Exception:
-            ...
+        xml = self._read_xml(archive)
+        if xml is not None:
+            encoding = _XML_ENCODING.match(xml)
+            if encoding is None or encoding.group(1).lower() in (b'utf-8', b'utf8'):
+                try:
+                    raw = xml.decode('utf-8-sig')
+                    if not raw.lstrip().startswith('<?xml'):
+                        raw = XML_DECLARATION + raw
+                    return raw
+                except UnicodeDecodeError:
+                    ...
+            try:
+                # ET.fromstring is used as xml can declare another encoding
+                return XML_DECLARATION + _tostring(_fromstring(xml, _parser), encoding='unicode')
+            except Exception:
+                ...
         return ''
 
     def write_tags(self, metadata: GenericMetadata, archive: Archiver) -> bool:
         if self.supports_tags(archive):
-            xml = b''
             try:  # read_file can cause an exception
-                if self.has_tags(archive):
-                    xml = archive.read_file(self.file)
-                return archive.write_file(self.file, self._bytes_from_metadata(metadata, xml))
+                xml = self._read_xml(archive) or b''
+                try:
+                    new_xml = self._bytes_from_metadata(metadata, xml)
+                except ET.ParseError:
+                    # has_tags only checks the root tag, replace a MetronInfo.xml that is malformed past it
+                    new_xml = self._bytes_from_metadata(metadata)
+                return archive.write_file(self.file, new_xml)
             except Exception as e:
                 logger.warning(f"Failed to write tag for MetronInfo: {e}")
         else:
@@ -177,8 +328,20 @@ class MetronInfo(Tag):
     def name(self) -> str:
         return 'Metron Info'
 
+    def _read_xml(self, archive: Archiver) -> bytes | None:
+        """Read MetronInfo.xml from the archive, None if it is missing or not MetronInfo data."""
+        try:  # read_file can cause an exception
+            if self.supports_tags(archive) and self.file in archive.get_filename_list():
+                xml = archive.read_file(self.file)
+                if self._validate_bytes(xml):
+                    return xml
+        except Exception:
+            ...
+        return None
+
     @classmethod
-    def _get_parseable_credits(cls) -> list[str]:
+    @functools.cache
+    def _get_parseable_credits(cls) -> frozenset[str]:
         parsable_credits: list[str] = []
         parsable_credits.extend(GenericMetadata.writer_synonyms)
         parsable_credits.extend(GenericMetadata.penciller_synonyms)
@@ -189,222 +352,127 @@ class MetronInfo(Tag):
         parsable_credits.extend(GenericMetadata.editor_synonyms)
         parsable_credits.extend(GenericMetadata.translator_synonyms)
         parsable_credits.extend(ADDITIONAL_CREDITS)
-        return parsable_credits
+        return frozenset(credit.casefold() for credit in parsable_credits)
 
     def _metadata_from_bytes(self, string: bytes) -> GenericMetadata:
-        root = ET.fromstring(string)
+        root = _fromstring(string, _parser)
         return self._convert_xml_to_metadata(root)
 
-    def _bytes_from_metadata(self, metadata: GenericMetadata, xml: bytes = b'') -> bytes:
-        root = self._convert_metadata_to_xml(metadata, xml)
-        return ET.tostring(root, encoding='utf-8', xml_declaration=True)
-
-    def _convert_metadata_to_xml(self, metadata: GenericMetadata, xml: bytes = b'') -> ET.Element:
-        def add_element(element: ET.Element, sub_element: str, text: str = '', attribs: dict[str, str] | None = None) -> None:
-            if not isinstance(element, ET.Element):
-                raise Exception('add_element: Not an ET.Element: %s', element)
-
-            attribs = attribs or {}
-
-            new_element = ET.SubElement(element, sub_element)
-
-            if text:
-                new_element.text = str(text)
-
-            for k, v in attribs.items():
-                new_element.attrib[k] = v
-
-        def add_path(path: str) -> ET.Element:
-            path_list: list[str] = path.split('/')
-            test_path: str = ''
-
-            for i, p in enumerate(path_list):
-                test_path = '/'.join(path_list[:i + 1])
-
-                if root.find(test_path) is None:
-                    if i == 0:
-                        add_element(root, p)
-                    else:
-                        *element_path_parts, element_name = test_path.split('/')
-                        element_path = '/'.join(element_path_parts)
-                        add_root = root.find(element_path)
-                        if add_root is None:
-                            raise Exception('add_path: Failed to find XML path element: %s', add_root)
-                        else:
-                            add_element(add_root, p)
-
-            ele = root.find(path)
-            if ele is None:
-                raise Exception('add_path: Failed to create XML path element: %s', path)
-            else:
-                return ele
-
-        def get_or_create_element(tag: str) -> ET.Element:
-            element = root.find(tag)
-            if element is None:
-                element = add_path(tag)
-            return element
-
-        def remove_attribs(ele: ET.Element) -> ET.Element:
-            ele.attrib.clear()
-            return ele
-
-        def modify_element(path: str, value: Any, attribs: dict[str, str] | None = None, clear_attribs: bool = False) -> None:
-            attribs = attribs or {}
-
-            # Split the path into parent and element name
-            *element_path_parts, element_name = path.split('/')
-            element_path = '/'.join(element_path_parts)
-
-            element_parent = get_or_create_element(element_path)
-
-            element = root.find(path)
-            if element is None:
-                try:
-                    element = ET.SubElement(element_parent, element_name)
-                except Exception as e:
-                    logger.warning(f'Failed to modify XML element: {element_path}, {element_name}. Error: {e}')
-                    return
-
-            if clear_attribs:
-                element = remove_attribs(element)
-
-            element.text = str(value)
-            for k, v in attribs.items():
-                element.attrib[k] = v
-
-        def clear_element(full_ele: str) -> None:
-            element_path, _, element_name = full_ele.rpartition('/')
-            element_parent = root.find(element_path)
-            if element_parent is not None:
-                for e in element_parent.findall(element_name):
-                    element_parent.remove(e)
-
-        def add_credit(creator: str, roles: list[str]) -> None:
-            if creator:
-                ele_credit = ET.SubElement(metron_credits, 'Credit')
-                add_element(ele_credit, 'Creator', creator)
-
-                if len(roles) > 0:
-                    ele_roles = ET.SubElement(ele_credit, 'Roles')
-                    for role in roles:
-                        ele_role = ET.SubElement(ele_roles, 'Role')
-                        ele_role.text = role
-                        # if role_id:
-                        # ele_role.attrib['id'] = role_id
+    def _bytes_from_metadata(
+        self,
+        metadata: GenericMetadata,
+        xml: bytes = b'',
+        modified: datetime.datetime | None = None,
+    ) -> bytes:
+        """Build MetronInfo.xml bytes, merging into xml when given.
+
+        modified is a private hook for scripts that build the bytes themselves, e.g. to give every archive in a bulk
+        retag the same LastModified time computed once. write_tags does not pass it and uses the current time.
+        """
+        root = self._convert_metadata_to_xml(metadata, xml, modified)
+        if lxml_available:
+            return _tostring(root, encoding='utf-8', xml_declaration=True, pretty_print=True)
 
+        ET.indent(root)
+        return _tostring(root, encoding='utf-8', xml_declaration=True)
+
+    def _new_tree(self) -> tuple[ET.Element, dict[str, ET.Element]]:
+        """Create an empty MetronInfo root with its top level elements, nothing needs finding."""
+        root = _Element('MetronInfo')
+        # Both lxml and ElementTree map the XSI namespace to the 'xsi' prefix
+        root.attrib[f'{{{XSI_NAMESPACE}}}noNamespaceSchemaLocation'] = 'MetronInfo.xsd'
+        return root, {tag: _SubElement(root, tag) for tag in _CONTAINER_TAGS}
+
+    def _merge_tree(self, xml: bytes) -> tuple[ET.Element, dict[str, ET.Element]]:
+        """Parse existing MetronInfo xml, appending any top level elements it is missing."""
+        root = _fromstring(xml, _parser)
+        # Keep the first of any repeated element as find would
+        existing: dict[str, ET.Element] = {}
+        for child in root:
+            existing.setdefault(child.tag, child)
+        return root, {tag: existing[tag] if tag in existing else _SubElement(root, tag) for tag in _CONTAINER_TAGS}
+
+    def _convert_metadata_to_xml(
+        self, metadata: GenericMetadata, xml: bytes = b'', modified: datetime.datetime | None = None,
+    ) -> ET.Element:
         # xml is empty bytes or has the read metroninfo xml
+        # modified is the LastModified time, see _bytes_from_metadata
         # shorthand for the metadata
         md = metadata
 
-        if xml:
-            root = ET.fromstring(xml)
-        else:
-            root = ET.Element('MetronInfo')
-            root.attrib['xmlns:xsi'] = 'http://www.w3.org/2001/XMLSchema-instance'
-            root.attrib['xsi:noNamespaceSchemaLocation'] = 'MetronInfo.xsd'
-
-        metron_ids = get_or_create_element('IDS')
-        metron_number = get_or_create_element('Number')
-        metron_series = get_or_create_element('Series')
-        metron_stories = get_or_create_element('Stories')
-        metron_title = get_or_create_element('CollectionTitle')
-        metron_summary = get_or_create_element('Summary')
-        metron_notes = get_or_create_element('Notes')
-        metron_prices = get_or_create_element('Prices')
-        metron_gtin = get_or_create_element('GTIN')
-        metron_genres = get_or_create_element('Genres')
-        metron_age_rating = get_or_create_element('AgeRating')
-        metron_tags = get_or_create_element('Tags')
-        metron_arcs = get_or_create_element('Arcs')
-        metron_characters = get_or_create_element('Characters')
-        metron_teams = get_or_create_element('Teams')
-        # metron_unis = get_or_create_element('Universes')
-        metron_locs = get_or_create_element('Locations')
-        # metron_reprints = get_or_create_element('Reprints')
-        metron_publisher = get_or_create_element('Publisher')
-        metron_cover_date = get_or_create_element('CoverDate')
-        metron_urls = get_or_create_element('URLs')
-        metron_credits = get_or_create_element('Credits')
-        metron_modified = get_or_create_element('LastModified')
+        root, containers = self._merge_tree(xml) if xml else self._new_tree()
+
+        metron_ids = containers['IDS']
+        metron_number = containers['Number']
+        metron_series = containers['Series']
+        metron_stories = containers['Stories']
+        metron_title = containers['CollectionTitle']
+        metron_summary = containers['Summary']
+        metron_notes = containers['Notes']
+        metron_prices = containers['Prices']
+        metron_gtin = containers['GTIN']
+        metron_genres = containers['Genres']
+        metron_age_rating = containers['AgeRating']
+        metron_tags = containers['Tags']
+        metron_arcs = containers['Arcs']
+        metron_characters = containers['Characters']
+        metron_teams = containers['Teams']
+        metron_locs = containers['Locations']
+        metron_publisher = containers['Publisher']
+        metron_cover_date = containers['CoverDate']
+        metron_urls = containers['URLs']
+        metron_credits = containers['Credits']
+        metron_modified = containers['LastModified']
 
         # Create a dict for each person so multiple roles can be added
         creators: dict[str, tuple[str, list[str]]] = {}  # casefold_name: (Name, list[role])
         for credit in md.credits:
+            # Spaces and underscores are treated alike so 'Alan Moore' and 'Alan_Moore' share one Credit
             creator_folded: str = credit.person.replace(' ', '_').casefold()
-            credit_role: str = ''
-
-            if credit.role.casefold() in GenericMetadata.writer_synonyms:
-                credit_role = 'Writer'
-            elif credit.role.casefold() in GenericMetadata.penciller_synonyms:
-                credit_role = 'Penciller'
-            elif credit.role.casefold() in GenericMetadata.inker_synonyms:
-                credit_role = 'Inker'
-            elif credit.role.casefold() in GenericMetadata.colorist_synonyms:
-                credit_role = 'Colorist'
-            elif credit.role.casefold() in GenericMetadata.letterer_synonyms:
-                credit_role = 'Letterer'
-            elif credit.role.casefold() in GenericMetadata.cover_synonyms:
-                credit_role = 'Cover'
-            elif credit.role.casefold() in GenericMetadata.editor_synonyms:
-                credit_role = 'Editor'
-            elif credit.role.casefold() in ADDITIONAL_CREDITS:
-                credit_role = credit.role
-            else:
-                credit_role = 'Other'
+            role_cf: str = credit.role.casefold()
+
+            credit_role: str | None = _ROLE_MAP.get(role_cf)
+            if credit_role is None:
+                # Additional credits keep the role as given
+                credit_role = credit.role if role_cf in _ADDITIONAL_SET else 'Other'
 
             creators.setdefault(creator_folded, (credit.person, []))[1].append(credit_role)
 
         # Add credits
         # Clear for now but later may preserve IDs
         metron_credits.clear()
-        for creator in creators.values():
-            add_credit(creator[0], creator[1])
+        for person, roles in creators.values():
+            _add_credit(metron_credits, person, roles)
+
+        # md belongs to the caller, normalised values are kept in locals
+        fmt: str | None = md.format
+        if fmt:
+            fmt = _FORMAT_MAP.get(fmt.casefold(), 'Single Issue')
 
         metron_series.clear()
         if md.series:
             if md.series_id is not None:
                 metron_series.attrib['id'] = md.series_id
 
-            add_element(metron_series, 'Name', md.series)
+            _SubElement(metron_series, 'Name').text = md.series
 
             if md.volume:
-                add_element(metron_series, 'Volume', str(md.volume))
-
-            if md.format:
-                # 'Annual', 'Digital Chapter', 'Graphic Novel', 'Hardcover', 'Limited Series', 'Omnibus', 'One-Shot',
-                # 'Single Issue', 'Trade Paperback'
-                format_dict = {
-                    'annual': 'Annual', 'digital chapter': 'Digital Chapter', 'graphic novel': 'Graphic Novel',
-                    'hardcover': 'Hardcover', 'limited series': 'Limited Series', 'omnibus': 'Omnibus', 'trade paperback': 'Trade Paperback',
-                    'oneshot': 'One-Shot', 'single issue': 'Single Issue',
-                }
-
-                format_tpb = ['trade paperback', 'collected edition', 'tpb', 'anthology', 'trade paper back']
-                format_one_shot = ['oneshot', 'one-shot', 'one shot', '1-shot', '1 shot', '1shot']
-
-                if md.format.lower().casefold() in format_tpb:
-                    md.format = format_tpb[0]
-                elif md.format.lower().casefold() in format_one_shot:
-                    md.format = format_one_shot[0]
-
-                md.format = format_dict.get(md.format.lower().casefold(), 'Single Issue')
+                _SubElement(metron_series, 'Volume').text = str(md.volume)
 
-                add_element(metron_series, 'Format', md.format)
+            if fmt:
+                _SubElement(metron_series, 'Format').text = fmt
 
             # Start Year?
 
             if md.issue_count:
-                add_element(metron_series, 'IssueCount', str(md.issue_count))
+                _SubElement(metron_series, 'IssueCount').text = str(md.issue_count)
 
             if md.volume_count:
-                add_element(metron_series, 'VolumeCount', str(md.volume_count))
+                _SubElement(metron_series, 'VolumeCount').text = str(md.volume_count)
 
             if md.series_aliases:
-                series_alts = ET.SubElement(metron_series, 'AlternativeNames')
-
-                for series_alt in md.series_aliases:
-                    add_element(series_alts, 'AlternativeName', series_alt)
+                series_alts = _SubElement(metron_series, 'AlternativeNames')
+                _add_text_elements(series_alts, 'AlternativeName', md.series_aliases)
 
         metron_number.clear()
         if md.issue:
@@ -413,21 +481,19 @@ class MetronInfo(Tag):
         metron_stories.clear()
         metron_title.clear()
         if md.title:
-            # If the md.format is 'Trade Paperback' (already processed), set the CollectionTitle. Otherwise, use stories
+            # If the format is 'Trade Paperback', set the CollectionTitle. Otherwise, use stories
             # TODO Put TPB title in both?
-            if md.format == 'Trade Paperback':
+            if fmt == 'Trade Paperback':
                 metron_title.text = md.title
             else:
-                split_titles = md.title.split(';')
-                for title in split_titles:
-                    add_element(metron_stories, 'Story', title.strip())
+                _add_text_elements(metron_stories, 'Story', [title.strip() for title in md.title.split(';')])
 
+        genres = set(md.genres)
         if md.manga is not None and md.manga.casefold().startswith('yes'):
-            md.genres.add('Manga')
+            genres.add('Manga')
 
         metron_genres.clear()
-        for g in md.genres:
-            add_element(metron_genres, 'Genre', g.capitalize())
+        _add_text_elements(metron_genres, 'Genre', [g.capitalize() for g in genres])
 
         metron_summary.clear()
         if md.description:
@@ -435,67 +501,33 @@ class MetronInfo(Tag):
 
         metron_urls.clear()
         if md.web_links:
-            for web in md.web_links:
-                add_element(metron_urls, 'URL', web)
+            _add_text_elements(metron_urls, 'URL', [str(web) for web in md.web_links])
 
         metron_age_rating.clear()
         if md.maturity_rating:
-            # Unknown, Everyone, Teen, Teen Plus, Mature, Explicit, Adult
-            mature_dict = {
-                'unknown': 'Unknown', 'everyone': 'Everyone', 'teen': 'Teen', 'teen plus': 'Teen Plus',
-                'mature': 'Mature', 'explicit': 'Explicit', 'adult': 'Adult',
-            }
-
-            # https://metron-project.github.io/docs/metroninfo/ratings
-            mature_everyone = ['everyone', 'G', 'all', 'all ages', 'a', 't']
-            mature_teen = ['teen', 'teenager', '13+', 'T+', 'PG', 'PSR']
-            mature_teenplus = ['teen plus', 'teenager plus', '15+', 'parental advisory', 'PG+', 'PSR+', 'ma15+']
-            mature_mature = ['mature', '17+', 'explicit content', 'm', 'mature 17+']  # Why 'Explicit Content' is mature, don't know
-            mature_explicit = ['explicit', 'R']
-            mature_adult = ['adult', 'adults only', 'adults only 18+', '18+', 'R18+', 'R+']
-
-            if md.maturity_rating.lower().casefold() in mature_everyone:
-                md.maturity_rating = mature_everyone[0]
-            elif md.maturity_rating.lower().casefold() in mature_teen:
-                md.maturity_rating = mature_teen[0]
-            elif md.maturity_rating.lower().casefold() in mature_teenplus:
-                md.maturity_rating = mature_teenplus[0]
-            elif md.maturity_rating.lower().casefold() in mature_mature:
-                md.maturity_rating = mature_mature[0]
-            elif md.maturity_rating.lower().casefold() in mature_explicit:
-                md.maturity_rating = mature_explicit[0]
-            elif md.maturity_rating.lower().casefold() in mature_adult:
-                md.maturity_rating = mature_adult[0]
-
-            md.maturity_rating = mature_dict.get(md.maturity_rating.lower().casefold(), 'Unknown')
-
-            metron_age_rating.text = md.maturity_rating
+            metron_age_rating.text = _MATURITY_MAP.get(md.maturity_rating.casefold(), 'Unknown')
 
         metron_tags.clear()
         if md.tags:
-            for tag in md.tags:
-                add_element(metron_tags, 'Tag', tag)
+            _add_text_elements(metron_tags, 'Tag', md.tags)
 
         metron_characters.clear()
         if md.characters:
-            for c in md.characters:
-                add_element(metron_characters, 'Character', c)
+            _add_text_elements(metron_characters, 'Character', md.characters)
 
         metron_teams.clear()
         if md.teams:
-            for team in md.teams:
-                add_element(metron_teams, 'Team', team)
+            _add_text_elements(metron_teams, 'Team', md.teams)
 
         metron_locs.clear()
         if md.locations:
-            for loc in md.locations:
-                add_element(metron_locs, 'Location', loc)
+            _add_text_elements(metron_locs, 'Location', md.locations)
 
         metron_arcs.clear()
         if md.story_arcs:
             for arc in md.story_arcs:
-                arc_element = ET.SubElement(metron_arcs, 'Arc')
-                add_element(arc_element, 'Name', arc)
+                arc_element = _SubElement(metron_arcs, 'Arc')
+                _SubElement(arc_element, 'Name').text = arc
 
         # Will preserve IDs of sources
         if md.issue_id:
@@ -508,18 +540,18 @@ class MetronInfo(Tag):
                     found = True
                     break
             if not found:
-                add_element(metron_ids, 'ID', md.issue_id, {'source': md.data_origin.name, 'primary': 'true'})
+                _SubElement(metron_ids, 'ID', {'source': md.data_origin.name, 'primary': 'true'}).text = md.issue_id
 
         metron_publisher.clear()
         if md.publisher:
-            add_element(metron_publisher, 'Name', md.publisher)
+            _SubElement(metron_publisher, 'Name').text = md.publisher
             if md.imprint:
-                add_element(metron_publisher, 'Imprint', md.imprint)
+                _SubElement(metron_publisher, 'Imprint').text = md.imprint
 
         metron_gtin.clear()
         # Assume ISBN
         if md.identifier:
-            add_element(metron_gtin, 'ISBN', md.identifier)
+            _SubElement(metron_gtin, 'ISBN').text = md.identifier
 
         metron_cover_date.clear()
         if md.year:
@@ -542,9 +574,11 @@ class MetronInfo(Tag):
         metron_prices.clear()
         if md.price:
             # Assume price is $
-            add_element(metron_prices, 'Price', str(md.price), {'country': 'US'})
+            _SubElement(metron_prices, 'Price', {'country': 'US'}).text = str(md.price)
 
-        metron_modified.text = datetime.datetime.now().isoformat()
+        if modified is None:
+            modified = datetime.datetime.now()
+        metron_modified.text = modified.isoformat()
 
         # MangaVolume
         # StoreDate
@@ -552,34 +586,9 @@ class MetronInfo(Tag):
         # Universes
         # Reprints
 
-        ET.indent(root)
-
         return root
 
     def _convert_xml_to_metadata(self, root: ET.Element) -> GenericMetadata:
-
-        def get_text(name: str, element: ET.Element | None = None) -> str | None:
-            if element is None:
-                tag = root.find('.//' + name)
-            else:
-                tag = element.find('.//' + name)
-
-            if tag is None:
-                return None
-
-            return tag.text
-
-        def get_element(name: str, element: ET.Element | None = None) -> ET.Element | None:
-            if element is None:
-                tag = root.find('.//' + name)
-            else:
-                tag = element.find('.//' + name)
-
-            if tag is None:
-                return None
-
-            return tag
-
         if root.tag != 'MetronInfo':
             raise Exception('Not a MetronInfo file')
 
@@ -588,56 +597,44 @@ class MetronInfo(Tag):
         # md.issue_id =  # No way to tie current selected talker to IDs?
 
         # Set the collection title first and then overwrite is there is also "Stories"
-        m_title: str | None = utils.xlate(get_text('CollectionTitle'))
-
-        m_series: ET.Element | None = get_element('Series')
-        m_stories: ET.Element | None = get_element('Stories')
-        m_genres: ET.Element | None = get_element('Genres')
-        m_arcs: ET.Element | None = get_element('Arcs')
-        m_publisher: ET.Element | None = get_element('Publisher')
-        m_urls: ET.Element | None = get_element('URLs')
-        m_characters: ET.Element | None = get_element('Characters')
-        m_teams: ET.Element | None = get_element('Teams')
-        m_locations: ET.Element | None = get_element('Locations')
-        m_tags: ET.Element | None = get_element('Tags')
-        m_prices: ET.Element | None = get_element('Prices')
-        m_gtin: ET.Element | None = get_element('GTIN')
-        m_credits: ET.Element | None = get_element('Credits')
+        m_title: str | None = utils.xlate(_get_text(root, 'CollectionTitle'))
+
+        m_series: ET.Element | None = root.find('Series')
+        m_stories: ET.Element | None = root.find('Stories')
+        m_genres: ET.Element | None = root.find('Genres')
+        m_arcs: ET.Element | None = root.find('Arcs')
+        m_publisher: ET.Element | None = root.find('Publisher')
+        m_urls: ET.Element | None = root.find('URLs')
+        m_characters: ET.Element | None = root.find('Characters')
+        m_teams: ET.Element | None = root.find('Teams')
+        m_locations: ET.Element | None = root.find('Locations')
+        m_tags: ET.Element | None = root.find('Tags')
+        m_prices: ET.Element | None = root.find('Prices')
+        m_gtin: ET.Element | None = root.find('GTIN')
+        m_credits: ET.Element | None = root.find('Credits')
 
         if m_title is None and m_stories is not None:
-            stories: list[str] = []
-            for story in m_stories:
-                if story.text is not None:
-                    stories.append(story.text)
-            m_title = ';'.join(stories)
-
-        md.series = utils.xlate(get_text('Name', m_series))
-        md.issue = utils.xlate(get_text('Number'))
-        md.issue_count = utils.xlate(get_text('IssueCount', m_series))
+            m_title = ';'.join([story.text for story in m_stories if story.text is not None])
+
+        md.series = utils.xlate(_get_text(m_series, 'Name'))
+        md.issue = utils.xlate(_get_text(root, 'Number'))
+        md.issue_count = utils.xlate(_get_text(m_series, 'IssueCount'))
         md.title = m_title
-        md.volume = utils.xlate(get_text('Volume', m_series))
+        md.volume = utils.xlate(_get_text(m_series, 'Volume'))
 
         if m_genres is not None:
-            genres = set()
-            for genre in m_genres:
-                genres.add(genre.text)
-            md.genres = genres
+            md.genres = {genre.text for genre in m_genres if genre.text is not None}
 
-        md.description = utils.xlate(get_text('Summary'))
-        md.notes = utils.xlate(get_text('Notes'))
+        md.description = utils.xlate(_get_text(root, 'Summary'))
+        md.notes = utils.xlate(_get_text(root, 'Notes'))
 
         if m_arcs is not None:
-            arcs: list[str] = []
-            for arc in m_arcs:
-                arc_text = get_text('Name', arc)
-                if arc_text is not None:
-                    arcs.append(arc_text)
-            md.story_arcs = arcs
+            md.story_arcs = _arc_names(m_arcs)
 
-        md.publisher = utils.xlate(get_text('Name', m_publisher))
-        md.imprint = utils.xlate(get_text('Imprint', m_publisher))
+        md.publisher = utils.xlate(_get_text(m_publisher, 'Name'))
+        md.imprint = utils.xlate(_get_text(m_publisher, 'Imprint'))
 
-        cover_date = utils.parse_date_str(utils.xlate(get_text('CoverDate')))
+        cover_date = utils.parse_date_str(utils.xlate(_get_text(root, 'CoverDate')))
         if cover_date[0] is not None:
             md.day = utils.xlate_int(cover_date[0])
         if cover_date[1] is not None:
@@ -668,49 +665,31 @@ class MetronInfo(Tag):
             md.language = m_series.attrib.get('lang')
 
         if m_urls is not None:
-            urls = []
-            for url in m_urls:
-                if url.text is not None:
-                    urls.append(url.text)
-            md.web_links = utils.split_urls(' '.join(urls))
+            md.web_links = utils.split_urls(' '.join([url.text for url in m_urls if url.text is not None]))
 
-        md.format = utils.xlate(get_text('Format', m_series))
-        md.maturity_rating = utils.xlate(get_text('AgeRating'))
-        md.page_count = utils.xlate_int(get_text('PageCount'))
+        md.format = utils.xlate(_get_text(m_series, 'Format'))
+        md.maturity_rating = utils.xlate(_get_text(root, 'AgeRating'))
+        md.page_count = utils.xlate_int(_get_text(root, 'PageCount'))
 
         if m_characters is not None:
-            characters = set()
-            for character in m_characters:
-                characters.add(character.text)
-            md.characters = characters
+            md.characters = {character.text for character in m_characters if character.text is not None}
 
         if m_teams is not None:
-            teams = set()
-            for team in m_teams:
-                teams.add(team.text)
-            md.teams = teams
+            md.teams = {team.text for team in m_teams if team.text is not None}
 
         if m_locations is not None:
-            locations = set()
-            for location in m_locations:
-                locations.add(location.text)
-            md.locations = locations
+            md.locations = {location.text for location in m_locations if location.text is not None}
 
         if m_tags is not None:
-            tags = set()
-            for tag in m_tags:
-                tags.add(tag.text)
-            md.tags = tags
+            md.tags = {tag.text for tag in m_tags if tag.text is not None}
 
         # Now extract the credit info
         if m_credits is not None:
             for credit in m_credits:
-                creator = utils.xlate(get_text('Creator', credit))
+                creator = utils.xlate(credit.findtext('Creator'))
                 if creator is not None:
-                    roles = get_element('Roles', credit)
-                    if roles is not None:
-                        for role in roles:
-                            md.add_credit(creator, role.text)
+                    for role in _credit_roles(credit):
+                        md.add_credit(creator, role)
 
         md.is_empty = False
 
@@ -718,11 +697,11 @@ class MetronInfo(Tag):
 
     def _validate_bytes(self, string: bytes) -> bool:
         """Verify that the string actually contains ACBF data in XML format."""
+        # Only the root tag is needed, stop at the first start event instead of building the whole tree
         try:
-            root = ET.fromstring(string)
-            if root.tag != 'MetronInfo':
-                return False
+            for _, element in ET.iterparse(io.BytesIO(string), events=('start',), **_parser_options):
+                return element.tag == 'MetronInfo'
         except ET.ParseError:
-            return False
+            ...
 
-        return True
+        return False